@@ -8,9 +8,18 @@ import webbrowser            # Pour ouvrir des liens web dans le navigateur par
 import os                    # Pour interagir avec le système d'exploitation (chemins de fichiers, dossiers)
 import sys                   # Pour accéder aux paramètres spécifiques du système (ex: PyInstaller)
 import json                  # Pour lire et écrire des données au format JSON
+import bisect                # Insertion/recherche dichotomique dans l'index trié des favoris
+import locale                # Tri alphabétique selon les règles de la langue de l'utilisateur
 from PIL import Image, ImageTk # Pillow pour le traitement des images (icônes)
 import requests              # Pour faire des requêtes HTTP (ex: récupérer les favicons)
 from io import BytesIO       # Pour manipuler des données binaires en mémoire (favicons)
+import heapq                 # File de priorité pour l'ordonnancement des favicons
+import itertools             # Compteur pour départager les demandes de même priorité
+import queue                 # Transmission des favicons téléchargés vers le thread de l'interface
+import threading             # Téléchargement des favicons en arrière-plan
+import time                  # Expiration des échecs de chargement des favicons
+from concurrent.futures import ThreadPoolExecutor # Vérification groupée des sites web
+import fav_sync              # Synchronisation des favoris via un dossier partagé (journal d'opérations)
 
 # --- Configuration initiale de CustomTkinter ---
 # Mode d'apparence par défaut (sombre)
@@ -27,6 +36,10 @@ AVAILABLE_COLOR_THEMES = ["blue", "green", "dark-blue"]
 # (favoris, paramètres) dans un emplacement approprié pour l'utilisateur,
 # évitant ainsi de mélanger les données utilisateur avec les fichiers du script.
 def get_app_data_path():
+    # La variable d'environnement FAVME_DATA_DIR permet d'utiliser un autre dossier
+    # (version portable, ou banc de mesure mémoire qui ne doit pas toucher aux vrais favoris)
+    if os.environ.get("FAVME_DATA_DIR"):
+        return os.environ["FAVME_DATA_DIR"]
     if sys.platform == "win32":
         # Pour Windows, utilise le dossier LOCALAPPDATA
         return os.path.join(os.environ["LOCALAPPDATA"], "FavMeData")
@@ -45,6 +58,8 @@ os.makedirs(APP_DATA_DIR, exist_ok=True)
 # Chemins complets des fichiers de configuration
 CONFIG_FILE = os.path.join(APP_DATA_DIR, "favorites_config.json")
 SETTINGS_FILE = os.path.join(APP_DATA_DIR, "app_settings.json")
+# Intervalle entre deux synchronisations automatiques (en millisecondes)
+SYNC_INTERVAL_MS = 30000
 
 # --- Fonctions de gestion de la persistance des données (JSON) ---
 def load_favorites(filename=CONFIG_FILE):
@@ -65,11 +80,29 @@ def load_favorites(filename=CONFIG_FILE):
             return {}, {}
     return {}, {} # Retourne des dictionnaires vides si le fichier n'existe pas
 
-def save_favorites(folders, websites, filename=CONFIG_FILE):
+def load_favorite_order(filename=CONFIG_FILE):
+    """
+    Charge les clés d'ordre manuel des favoris (voir save_favorites).
+    Retourne {True: {nom: clé} pour les dossiers, False: {nom: clé} pour les sites web}.
+    """
+    order = {}
+    if os.path.exists(filename):
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                order = json.load(f).get("order", {})
+        except json.JSONDecodeError:
+            pass # Déjà signalé par load_favorites
+    return {True: dict(order.get("folders", {})), False: dict(order.get("websites", {}))}
+
+def save_favorites(folders, websites, filename=CONFIG_FILE, order=None):
     """
     Sauvegarde les favoris (dossiers et sites web) dans un fichier JSON.
+    :param order: Les clés d'ordre manuel ({True: {...}, False: {...}}), seules celles des favoris existants sont écrites.
     """
     data = {"folders": folders, "websites": websites}
+    if order is not None:
+        data["order"] = {"folders": {name: key for name, key in order[True].items() if name in folders},
+                         "websites": {name: key for name, key in order[False].items() if name in websites}}
     with open(filename, 'w', encoding='utf-8') as f:
         # Écrit les données dans le fichier avec un formatage indenté pour la lisibilité
         json.dump(data, f, indent=4)
@@ -119,6 +152,8 @@ ctk.set_default_color_theme(app_settings["color_theme"])
 
 # --- Chargement initial des favoris ---
 favorite_folders, favorite_websites = load_favorites()
+# Clés d'ordre manuel (glisser-déposer) de chaque favori
+favorite_order = load_favorite_order()
 
 # --- Vérification de l'existence des dossiers au démarrage ---
 # Cette section vérifie si les chemins de dossiers enregistrés existent toujours sur le système.
@@ -133,7 +168,243 @@ for name, path in list(favorite_folders.items()):
         print(f"✅ Le dossier '{name}' existe.")
 print("------------------------------------------\n")
 # Sauvegarde les favoris après la vérification pour persister les suppressions
-save_favorites(favorite_folders, favorite_websites)
+save_favorites(favorite_folders, favorite_websites, order=favorite_order)
+
+# --- Synchronisation entre postes via un dossier partagé ---
+# Chaque ajout/modification/suppression est enregistré comme une opération dans un journal
+# du dossier partagé choisi par l'utilisateur ; les autres postes ne rejouent que ce qu'ils n'ont pas vu.
+sync_log = None # Instance de fav_sync.SyncLog si la synchronisation est activée
+
+def start_sync(directory):
+    """
+    Active la synchronisation avec le dossier partagé donné :
+    récupère les changements des autres postes puis publie les favoris locaux encore inconnus.
+    Les changements sont récupérés dans des copies des favoris, reportées puis sauvegardées
+    seulement si la lecture a réussi. L'appelant doit ensuite reconstruire les index triés
+    (rebuild_order_indexes), que la synchronisation ait pu être activée ou non.
+    Retourne True si la synchronisation a pu être activée.
+    """
+    global sync_log
+    sync_log = None
+    folders, websites = dict(favorite_folders), dict(favorite_websites)
+    try:
+        # État local (identité du poste, progression de lecture) propre à ce dossier partagé
+        log = fav_sync.SyncLog(directory, fav_sync.state_file_for(APP_DATA_DIR, directory))
+        changed = log.pull(folders, websites)
+    except OSError as e:
+        print(f"Erreur d'accès au dossier de synchronisation {directory}: {e}")
+        return False
+    if changed:
+        # Lecture réussie : les changements sont notés comme vus dans l'état local du poste,
+        # ils doivent donc être gardés même si la publication ci-dessous échoue
+        favorite_folders.clear()
+        favorite_folders.update(folders)
+        favorite_websites.clear()
+        favorite_websites.update(websites)
+        save_favorites(favorite_folders, favorite_websites, order=favorite_order)
+    try:
+        log.publish_missing(favorite_folders, favorite_websites)
+    except OSError as e:
+        print(f"Erreur d'écriture dans le dossier de synchronisation {directory}: {e}")
+        return False
+    sync_log = log
+    return True
+
+def record_sync_change(is_folder, name, value=None):
+    """
+    Enregistre un changement local dans le journal de synchronisation (si elle est activée).
+    :param value: La nouvelle valeur du favori, ou None pour une suppression.
+    """
+    record_sync_changes(is_folder, [(name, value)])
+
+def record_sync_changes(is_folder, changes):
+    """
+    Enregistre plusieurs changements locaux en une seule écriture du journal de synchronisation.
+    :param changes: Liste de (nom, valeur) ; une valeur None signifie une suppression.
+    Retourne le nombre de favoris modifiés par des changements d'autres postes récupérés
+    lors d'un compactage (l'appelant doit alors rafraîchir tout l'affichage).
+    """
+    if sync_log is None:
+        return 0
+    kind = "folders" if is_folder else "websites"
+    try:
+        sync_log.record_many([(kind, name, value) for name, value in changes])
+        # Compactage périodique : instantané de l'état et suppression des anciens journaux de ce poste.
+        # Le compactage rejoue aussi les changements des autres postes : ils sont sauvegardés comme dans sync_now()
+        if sync_log.needs_compaction():
+            changed = sync_log.compact(favorite_folders, favorite_websites)
+            if changed:
+                rebuild_order_indexes()
+                save_favorites(favorite_folders, favorite_websites, order=favorite_order)
+            return changed
+    except OSError as e:
+        print(f"Erreur d'écriture dans le journal de synchronisation : {e}")
+    return 0
+
+def sync_now():
+    """Rejoue les changements des autres postes et met à jour l'affichage si nécessaire."""
+    if sync_log is None:
+        return
+    try:
+        changed = sync_log.pull(favorite_folders, favorite_websites)
+    except OSError as e:
+        print(f"Erreur de lecture du dossier de synchronisation : {e}")
+        return
+    if changed:
+        rebuild_order_indexes()
+        save_favorites(favorite_folders, favorite_websites, order=favorite_order)
+        update_view()
+
+def schedule_sync():
+    """Synchronise puis se replanifie après SYNC_INTERVAL_MS."""
+    sync_now()
+    app.after(SYNC_INTERVAL_MS, schedule_sync)
+
+def choose_sync_directory():
+    """Permet de choisir (ou de désactiver) le dossier partagé utilisé pour la synchronisation."""
+    global sync_log
+    directory = filedialog.askdirectory(title="Choisir le dossier de synchronisation partagé")
+    if not directory:
+        if sync_log is not None and messagebox.askyesno("Synchronisation", "Désactiver la synchronisation des favoris ?"):
+            sync_log = None
+            app_settings.pop("sync_directory", None)
+            save_settings(app_settings)
+        return
+    synced = start_sync(directory)
+    # Des changements ont pu être récupérés même si l'activation a échoué : index et affichage à jour
+    rebuild_order_indexes()
+    update_view()
+    if synced:
+        app_settings["sync_directory"] = directory
+        save_settings(app_settings)
+        messagebox.showinfo("Synchronisation", f"Les favoris sont synchronisés via le dossier :\n{directory}")
+    else:
+        messagebox.showerror("Synchronisation", f"Impossible d'utiliser le dossier '{directory}' pour la synchronisation.")
+
+# Reprend la synchronisation configurée lors d'une session précédente
+# (les index triés sont construits plus bas, à partir des favoris éventuellement mis à jour)
+if app_settings.get("sync_directory"):
+    start_sync(app_settings["sync_directory"])
+
+# --- Index trié des favoris (ordre alphabétique ou manuel) ---
+# Au lieu de trier les favoris à chaque affichage, un index trié est maintenu à chaque
+# ajout/renommage/suppression : la position est trouvée par recherche dichotomique (bisect, O(log n)),
+# puis l'élément est inséré/retiré dans une liste Python (décalage mémoire O(n), mais très rapide
+# pour quelques milliers de favoris, et négligeable devant la création d'une ligne de widgets).
+# Deux modes d'ordre : "alpha" (alphabétique selon la langue de l'utilisateur, sans tenir compte
+# de la casse) et "manual" (ordre choisi par glisser-déposer, via des clés d'ordre fractionnaires).
+SORT_MODES = ["alpha", "manual"]
+DEFAULT_SORT_MODE = "alpha"
+# Espacement des clés d'ordre manuel : un déplacement prend le milieu de ses deux voisins,
+# il ne modifie donc que la clé de l'élément déplacé.
+ORDER_STEP = 1024.0
+
+# Utilise les règles de tri de la langue du système (accents, etc.) si elles sont disponibles
+try:
+    locale.setlocale(locale.LC_COLLATE, "")
+except locale.Error:
+    pass # Locale indisponible : on garde l'ordre par défaut ("C"), insensible à la casse ci-dessous
+
+if app_settings.get("sort_mode") not in SORT_MODES:
+    app_settings["sort_mode"] = DEFAULT_SORT_MODE
+
+def collation_key(name):
+    """Clé de tri alphabétique : insensible à la casse et conforme à la langue ("apple" avant "Zeta")."""
+    return (locale.strxfrm(name.casefold()), name)
+
+class OrderIndex:
+    """
+    Liste triée des noms de favoris, maintenue de façon incrémentale.
+    Recherche en O(log n) ; insertion/suppression en O(n) à cause du décalage de la liste.
+    :param names: Les noms initiaux.
+    :param sort_key: Fonction nom -> clé de tri.
+    """
+    def __init__(self, names, sort_key):
+        self.sort_key = sort_key
+        self.key_of = {name: sort_key(name) for name in names} # Clé de chaque nom (pour le retrouver)
+        self.entries = sorted((key, name) for name, key in self.key_of.items())
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return (name for _, name in self.entries)
+
+    def name_at(self, position):
+        """Retourne le nom à la position donnée."""
+        return self.entries[position][1]
+
+    def position(self, name):
+        """Retourne la position d'un nom dans l'ordre (recherche dichotomique)."""
+        return bisect.bisect_left(self.entries, (self.key_of[name], name))
+
+    def insert(self, name):
+        """Insère un nom à sa place et retourne sa position."""
+        key = self.sort_key(name)
+        self.key_of[name] = key
+        position = bisect.bisect_left(self.entries, (key, name))
+        self.entries.insert(position, (key, name))
+        return position
+
+    def remove(self, name):
+        """Retire un nom de l'index (sans effet s'il n'y est pas)."""
+        if name in self.key_of:
+            del self.entries[self.position(name)]
+            del self.key_of[name]
+
+    def rename(self, old_name, new_name):
+        """Renomme un favori et retourne sa nouvelle position."""
+        self.remove(old_name)
+        return self.insert(new_name)
+
+def ensure_order_keys(is_folder):
+    """Attribue une clé d'ordre manuel (à la fin de la liste) aux favoris qui n'en ont pas encore."""
+    favorites = favorite_folders if is_folder else favorite_websites
+    order = favorite_order[is_folder]
+    missing = sorted((name for name in favorites if name not in order), key=collation_key)
+    last_key = max(order.values(), default=0.0)
+    for name in missing:
+        last_key += ORDER_STEP
+        order[name] = last_key
+
+def make_sort_key(is_folder):
+    """Retourne la fonction de tri correspondant au mode d'ordre courant."""
+    if app_settings["sort_mode"] == "manual":
+        order = favorite_order[is_folder]
+        return lambda name: (order[name], name)
+    return collation_key
+
+def rebuild_order_indexes():
+    """
+    Reconstruit entièrement les index triés (démarrage, changement de mode,
+    favoris modifiés en dehors des fonctions apply_*, ex: synchronisation).
+    """
+    for is_folder, favorites in ((True, favorite_folders), (False, favorite_websites)):
+        ensure_order_keys(is_folder)
+        favorite_indexes[is_folder] = OrderIndex(favorites, make_sort_key(is_folder))
+
+def index_insert(name, is_folder):
+    """Insère un nouveau favori dans son index (avec une clé d'ordre manuel en fin de liste)."""
+    order = favorite_order[is_folder]
+    if name not in order:
+        order[name] = max(order.values(), default=0.0) + ORDER_STEP
+    favorite_indexes[is_folder].insert(name)
+
+def index_rename(old_name, new_name, is_folder):
+    """Renomme un favori dans son index ; il garde sa place dans l'ordre manuel."""
+    order = favorite_order[is_folder]
+    if old_name != new_name and old_name in order:
+        order[new_name] = order.pop(old_name)
+    favorite_indexes[is_folder].rename(old_name, new_name)
+
+def index_remove(name, is_folder):
+    """Retire un favori supprimé de son index et de l'ordre manuel."""
+    favorite_indexes[is_folder].remove(name)
+    favorite_order[is_folder].pop(name, None)
+
+# Index triés par type (clé True = dossiers, False = sites web)
+favorite_indexes = {}
+rebuild_order_indexes()
 
 # --- Fonction utilitaire pour obtenir le chemin des ressources (icônes) ---
 def get_resource_path(relative_path):
@@ -247,16 +518,27 @@ def get_favicon_url(url):
 
 # Cache pour stocker les favicons déjà chargés et éviter de les re-télécharger
 favicon_cache = {}
-
-def load_favicon(url, size=(16, 16)):
+# URLs dont le favicon n'a pas pu être chargé -> heure de l'échec (time.monotonic()).
+# L'échec peut être passager (hors ligne, délai dépassé) : l'URL est retentée après FAVICON_RETRY_DELAY_S.
+favicon_failures = {}
+FAVICON_RETRY_DELAY_S = 300
+
+def favicon_recently_failed(url):
+    """Indique si le favicon de cette URL a échoué il y a moins de FAVICON_RETRY_DELAY_S secondes."""
+    failed_at = favicon_failures.get(url)
+    if failed_at is None:
+        return False
+    if time.monotonic() - failed_at >= FAVICON_RETRY_DELAY_S:
+        del favicon_failures[url] # Échec expiré : on retentera
+        return False
+    return True
+
+def fetch_favicon_image(url, size=(16, 16)):
     """
     Télécharge et redimensionne le favicon d'une URL donnée.
-    Retourne un objet CTkImage si le favicon est trouvé, None sinon.
-    Utilise un cache pour les favicons déjà téléchargés.
+    Retourne une image PIL, ou None si le favicon est introuvable.
+    N'utilise pas Tkinter : peut être appelée depuis un thread d'arrière-plan.
     """
-    if url in favicon_cache:
-        return favicon_cache[url]
-
     favicon_url = get_favicon_url(url)
     if favicon_url:
         try:
@@ -264,16 +546,210 @@ def load_favicon(url, size=(16, 16)):
             response.raise_for_status() # Lève une exception pour les codes d'erreur HTTP
             image_data = BytesIO(response.content)
             img = Image.open(image_data)
-            img = img.resize(size, Image.Resampling.LANCZOS) # Redimensionne avec une bonne qualité
-            ctk_image = ctk.CTkImage(img, size=size)
-            favicon_cache[url] = ctk_image # Ajoute au cache
-            return ctk_image
+            return img.resize(size, Image.Resampling.LANCZOS) # Redimensionne avec une bonne qualité
         except requests.exceptions.RequestException as e:
             print(f"Erreur de requête pour favicon {favicon_url}: {e}")
         except Exception as e:
             print(f"Erreur de chargement/redimensionnement du favicon pour {url}: {e}")
     return None
 
+def forget_favicon(url):
+    """
+    Retire du cache le favicon d'une URL qui n'est plus utilisée par aucun favori,
+    pour que le cache ne grossisse pas indéfiniment au fil des modifications.
+    """
+    if url not in favorite_websites.values():
+        favicon_scheduler.cancel(url) # Un téléchargement en cours ne remettra pas l'image en cache
+        favicon_cache.pop(url, None)
+        favicon_failures.pop(url, None)
+
+# --- Ordonnanceur des favicons (priorité aux lignes visibles) ---
+# Priorités (plus petit = plus urgent) : lignes visibles, puis l'écran suivant (préchargement), puis le reste
+FAVICON_PRIORITY_VISIBLE = 0
+FAVICON_PRIORITY_NEXT_SCREEN = 1
+FAVICON_PRIORITY_BACKGROUND = 2
+FAVICON_WORKERS = 4           # Nombre de téléchargements simultanés
+FAVICON_POLL_MS = 50          # Intervalle de récupération des résultats par l'interface
+
+class FaviconScheduler:
+    """
+    Ordonnanceur placé devant le chargement des favicons.
+    Les demandes sont rangées dans une file de priorité selon la visibilité de leur ligne à l'écran,
+    re-priorisées lors du défilement, et annulées lorsque les lignes sont détruites (update_view/toggle_view).
+    Les téléchargements se font dans des threads ; seul le thread de l'interface touche aux widgets.
+    """
+    def __init__(self, root, scroll_frame, workers=FAVICON_WORKERS):
+        """
+        :param root: La fenêtre principale (pour planifier les mises à jour de l'interface).
+        :param scroll_frame: Le cadre défilant contenant les lignes des sites web.
+        :param workers: Le nombre de threads de téléchargement.
+        """
+        self.root = root
+        self.scroll_frame = scroll_frame
+        self.condition = threading.Condition()
+        self.heap = []                      # Entrées (priorité, ordre, url) ; les entrées périmées sont ignorées
+        self.pending = {}                   # url -> {"key": priorité courante, "rows": [(ligne, bouton), ...]}
+        self.in_flight = {}                 # url -> lignes en attente d'un téléchargement déjà commencé
+        self.dropped = set()                # URLs en cours de téléchargement dont le résultat est à jeter
+        self.counter = itertools.count()
+        self.results = queue.Queue()        # (url, image PIL ou None) produits par les threads
+        self.reprioritize_job = None
+        self.poll_job = None                # Relève des résultats planifiée (seulement s'il y a du travail)
+        # Les threads n'attaquent la file qu'après le calcul des priorités selon l'écran :
+        # sinon ils commenceraient par les premières lignes dans l'ordre de la liste, visibles ou non.
+        self.dispatch_ready = False
+        for _ in range(workers):
+            threading.Thread(target=self._worker, daemon=True).start()
+
+    def request(self, url, row, button, index):
+        """
+        Demande le favicon de `url` pour le bouton d'une ligne.
+        :param row: Le cadre de la ligne (pour calculer sa visibilité).
+        :param button: Le bouton qui recevra l'image.
+        :param index: La position de la ligne dans la liste (départage les priorités égales).
+        """
+        with self.condition:
+            if url in self.in_flight:
+                self.in_flight[url].append((row, button))
+                self.dropped.discard(url) # De nouveau utilisée : le résultat sera gardé
+                return
+            request = self.pending.get(url)
+            if request is not None:
+                request["rows"].append((row, button))
+                return
+            key = (FAVICON_PRIORITY_BACKGROUND, index)
+            self.pending[url] = {"key": key, "rows": [(row, button)], "index": index}
+            heapq.heappush(self.heap, (key, next(self.counter), url))
+            if self.dispatch_ready:
+                self.condition.notify()
+        self._schedule_poll()
+
+    def cancel(self, url):
+        """
+        Annule la demande pour une URL qui n'est plus utilisée (ex: favori supprimé ou modifié).
+        Si le téléchargement a déjà commencé, son résultat ne sera ni mis en cache ni noté comme échec.
+        """
+        with self.condition:
+            self.pending.pop(url, None) # L'entrée restée dans le tas sera ignorée
+            if url in self.in_flight:
+                self.in_flight[url] = []
+                self.dropped.add(url)
+
+    def cancel_all(self):
+        """Annule toutes les demandes en attente (les lignes correspondantes vont être détruites)."""
+        with self.condition:
+            self.pending.clear()
+            self.heap.clear()
+            # Les prochaines demandes attendront la re-priorisation de la nouvelle liste
+            self.dispatch_ready = False
+            # Les téléchargements déjà commencés se terminent (résultat mis en cache) sans toucher aux lignes
+            for url in self.in_flight:
+                self.in_flight[url] = []
+
+    def schedule_reprioritize(self):
+        """Planifie une re-priorisation (regroupe les événements de défilement rapprochés)."""
+        if self.reprioritize_job is None:
+            self.reprioritize_job = self.root.after_idle(self.reprioritize)
+
+    def reprioritize(self):
+        """Recalcule la priorité de chaque demande en attente selon la zone visible du cadre défilant."""
+        self.reprioritize_job = None
+        with self.condition:
+            requests_snapshot = list(self.pending.items())
+        if requests_snapshot:
+            self._compute_priorities(requests_snapshot)
+        # Priorités connues : les threads peuvent commencer
+        with self.condition:
+            self.dispatch_ready = True
+            self.condition.notify_all()
+
+    def _compute_priorities(self, requests_snapshot):
+        """Met à jour la priorité des demandes selon la position de leur ligne dans la zone visible."""
+        # Calculs de géométrie hors verrou (appels Tk, thread de l'interface uniquement).
+        # La mise en page est forcée pour que les lignes tout juste créées aient leur position réelle.
+        try:
+            self.root.update_idletasks()
+            content_height = self.scroll_frame.winfo_height()
+            first, last = self.scroll_frame._parent_canvas.yview()
+        except tk.TclError:
+            return
+        view_top = first * content_height
+        view_bottom = last * content_height
+        screen_height = view_bottom - view_top
+        new_keys = {}
+        for url, request in requests_snapshot:
+            best = FAVICON_PRIORITY_BACKGROUND
+            for row, _ in request["rows"]:
+                try:
+                    if not row.winfo_exists() or not row.winfo_ismapped():
+                        continue
+                    top = row.winfo_y()
+                    bottom = top + row.winfo_height()
+                except tk.TclError:
+                    continue
+                if bottom >= view_top and top <= view_bottom:
+                    best = FAVICON_PRIORITY_VISIBLE
+                    break
+                if top <= view_bottom + screen_height and bottom >= view_top:
+                    best = min(best, FAVICON_PRIORITY_NEXT_SCREEN)
+            new_keys[url] = (best, request["index"])
+
+        with self.condition:
+            for url, key in new_keys.items():
+                request = self.pending.get(url)
+                if request is not None and request["key"] != key:
+                    request["key"] = key
+                    heapq.heappush(self.heap, (key, next(self.counter), url))
+
+    def _worker(self):
+        """Thread de téléchargement : traite les demandes par ordre de priorité."""
+        while True:
+            with self.condition:
+                while True:
+                    while not self.heap or not self.dispatch_ready:
+                        self.condition.wait()
+                    key, _, url = heapq.heappop(self.heap)
+                    request = self.pending.get(url)
+                    if request is not None and request["key"] == key:
+                        break # Entrée à jour (sinon : annulée ou re-priorisée depuis)
+                del self.pending[url]
+                self.in_flight[url] = request["rows"]
+            self.results.put((url, fetch_favicon_image(url)))
+
+    def _poll_results(self):
+        """Applique, dans le thread de l'interface, les favicons téléchargés aux lignes encore présentes."""
+        while True:
+            try:
+                url, img = self.results.get_nowait()
+            except queue.Empty:
+                break
+            with self.condition:
+                rows = self.in_flight.pop(url, [])
+                dropped = url in self.dropped
+                self.dropped.discard(url)
+            if dropped:
+                continue # Favori supprimé ou modifié pendant le téléchargement
+            if img is None:
+                favicon_failures[url] = time.monotonic()
+                continue
+            ctk_image = ctk.CTkImage(img, size=img.size)
+            favicon_cache[url] = ctk_image
+            for _, button in rows:
+                try:
+                    if button.winfo_exists():
+                        button.configure(image=ctk_image)
+                except tk.TclError:
+                    pass # Ligne détruite entre-temps
+        self.poll_job = None
+        self._schedule_poll()
+
+    def _schedule_poll(self):
+        """Planifie la prochaine relève des résultats, uniquement tant que des demandes sont en cours."""
+        with self.condition:
+            busy = bool(self.pending or self.in_flight)
+        if busy and self.poll_job is None:
+            self.poll_job = self.root.after(FAVICON_POLL_MS, self._poll_results)
+
 # --- Fonctions pour la gestion dynamique des favoris avec CTk Toplevel (fenêtre CustomTkinter) ---
 class FavoriteDialog(ctk.CTkToplevel):
     """
@@ -374,6 +850,201 @@ class FavoriteDialog(ctk.CTkToplevel):
         self.result = None # Indique qu'aucune action n'a été confirmée
         self.destroy() # Ferme la boîte de dialogue
 
+# --- Fonctions appliquant les changements de favoris (sans boîte de dialogue) ---
+def apply_add_favorite(name, value, is_folder):
+    """Ajoute un favori, le sauvegarde, le publie pour la synchronisation et met à jour l'affichage."""
+    if is_folder:
+        favorite_folders[name] = value
+    else:
+        favorite_websites[name] = value
+    index_insert(name, is_folder)
+    save_favorites(favorite_folders, favorite_websites, order=favorite_order) # Sauvegarde les changements
+    record_sync_change(is_folder, name, value) # Publie l'ajout pour les autres postes
+    update_view() # Met à jour l'affichage de l'interface
+
+def apply_edit_favorite(old_name, new_name, new_value, is_folder):
+    """Modifie (et renomme éventuellement) un favori, puis sauvegarde, publie et met à jour l'affichage."""
+    favorites = favorite_folders if is_folder else favorite_websites
+    old_value = favorites[old_name]
+    # Si le nom a changé, supprime l'ancien et ajoute le nouveau
+    if new_name != old_name:
+        del favorites[old_name]
+    favorites[new_name] = new_value
+    if new_name != old_name:
+        index_rename(old_name, new_name, is_folder)
+    if not is_folder and old_value != new_value:
+        forget_favicon(old_value)
+    save_favorites(favorite_folders, favorite_websites, order=favorite_order) # Sauvegarde les changements
+    # Publie la modification (un renommage = suppression de l'ancien nom + ajout du nouveau)
+    if new_name != old_name:
+        record_sync_change(is_folder, old_name)
+    record_sync_change(is_folder, new_name, new_value)
+    update_view() # Met à jour l'affichage
+
+def apply_delete_favorite(name, is_folder):
+    """Supprime un favori, puis sauvegarde, publie la suppression et met à jour l'affichage."""
+    if is_folder:
+        del favorite_folders[name]
+    else:
+        forget_favicon(favorite_websites.pop(name))
+    index_remove(name, is_folder)
+    save_favorites(favorite_folders, favorite_websites, order=favorite_order) # Sauvegarde les changements
+    record_sync_change(is_folder, name) # Publie la suppression pour les autres postes
+    update_view() # Met à jour l'affichage
+
+# --- Sélection multiple et actions groupées ---
+# Noms des favoris sélectionnés, par type (clé True = dossiers, False = sites web)
+selected_favorites = {True: set(), False: set()}
+# Lignes affichées par type et par nom, pour les mises à jour incrémentales de l'affichage
+favorite_rows = {True: {}, False: {}}
+# Vrai pendant la vérification des sites web (le bouton "Vérifier" reste désactivé)
+recheck_running = False
+
+def set_favorite_selected(name, is_folder, selected):
+    """Ajoute ou retire un favori de la sélection (appelé par la case à cocher de sa ligne)."""
+    if selected:
+        selected_favorites[is_folder].add(name)
+    else:
+        selected_favorites[is_folder].discard(name)
+    update_selection_bar()
+
+def select_all_favorites():
+    """Sélectionne tous les favoris de la vue courante, ou les désélectionne s'ils le sont déjà tous."""
+    favorites = favorite_folders if showing_folders else favorite_websites
+    if len(selected_favorites[showing_folders]) == len(favorites):
+        selected_favorites[showing_folders].clear()
+    else:
+        selected_favorites[showing_folders] = set(favorites)
+    refresh_selection_boxes(showing_folders)
+
+def refresh_selection_boxes(is_folder):
+    """Met à jour les cases à cocher des lignes affichées selon la sélection."""
+    for name, row in favorite_rows[is_folder].items():
+        if name in selected_favorites[is_folder]:
+            row.select_box.select()
+        else:
+            row.select_box.deselect()
+    update_selection_bar()
+
+def update_selection_bar():
+    """Met à jour le compteur de sélection et l'état des boutons d'actions groupées."""
+    count = len(selected_favorites[showing_folders])
+    selection_label.configure(text=f"{count} sélectionné(s)")
+    state = "normal" if count else "disabled"
+    recheck_selected_button.configure(state="disabled" if recheck_running else state)
+    delete_selected_button.configure(state=state)
+
+def apply_delete_favorites(names, is_folder):
+    """
+    Supprime plusieurs favoris en une seule transaction : une sauvegarde, une écriture du journal
+    de synchronisation et une mise à jour incrémentale de l'affichage (seules les lignes concernées sont détruites).
+    Si la sauvegarde échoue, les favoris sont restaurés.
+    Retourne la liste des noms supprimés.
+    """
+    favorites = favorite_folders if is_folder else favorite_websites
+    removed = {name: favorites.pop(name) for name in names if name in favorites}
+    if not removed:
+        return []
+    try:
+        save_favorites(favorite_folders, favorite_websites, order=favorite_order) # Une seule sauvegarde pour tout le lot
+    except OSError as e:
+        favorites.update(removed) # Annule la transaction
+        messagebox.showerror("Erreur", f"Impossible de sauvegarder les favoris : {e}")
+        return []
+    for name in removed:
+        index_remove(name, is_folder)
+    # Un compactage déclenché ici peut aussi rejouer des changements d'autres postes
+    remote_changes = record_sync_changes(is_folder, [(name, None) for name in removed])
+
+    if not is_folder:
+        remaining_urls = set(favorite_websites.values())
+        for url in set(removed.values()) - remaining_urls:
+            favicon_scheduler.cancel(url)
+            favicon_cache.pop(url, None)
+            favicon_failures.pop(url, None)
+
+    selected_favorites[is_folder].difference_update(removed)
+    if not favorites or remote_changes:
+        # Liste vide (message "Aucun ... favori ajouté.") ou changements d'autres postes : affichage complet
+        update_view()
+    else:
+        for name in removed:
+            row = favorite_rows[is_folder].pop(name, None)
+            if row is not None:
+                row.destroy()
+        update_selection_bar()
+    return list(removed)
+
+def delete_selected_favorites():
+    """Supprime les favoris sélectionnés de la vue courante après une seule confirmation."""
+    is_folder = showing_folders
+    names = sorted(selected_favorites[is_folder])
+    if not names:
+        return
+    type_text = "dossier(s)" if is_folder else "site(s) web"
+    if messagebox.askyesno("Confirmer la suppression", f"Êtes-vous sûr de vouloir supprimer {len(names)} {type_text} favori(s) sélectionné(s) ?"):
+        apply_delete_favorites(names, is_folder)
+
+def is_website_reachable(url):
+    """Indique si un site web répond (requête HEAD, les codes d'erreur 4xx/5xx comptent comme inaccessibles)."""
+    if not url.startswith(("http://", "https://")):
+        url = "http://" + url
+    try:
+        response = requests.head(url, allow_redirects=True, timeout=5)
+        # Certains serveurs refusent HEAD (405) tout en étant en ligne
+        return response.status_code < 400 or response.status_code == 405
+    except requests.exceptions.RequestException:
+        return False
+
+def recheck_selected_favorites():
+    """
+    Vérifie les favoris sélectionnés (existence du dossier, ou réponse du site web).
+    Seuls les favoris inaccessibles restent sélectionnés, prêts à être supprimés en une fois.
+    """
+    global recheck_running
+    is_folder = showing_folders
+    names = sorted(selected_favorites[is_folder])
+    if not names or recheck_running:
+        return
+    if is_folder:
+        finish_recheck(is_folder, names, [name for name in names if not os.path.exists(favorite_folders[name])])
+        return
+
+    # Sites web : vérifications en parallèle dans des threads, résultat récupéré par l'interface
+    urls = {name: favorite_websites[name] for name in names}
+    results = {}
+    def check_all():
+        with ThreadPoolExecutor(max_workers=FAVICON_WORKERS * 2) as executor:
+            reachable = dict(zip(urls, executor.map(is_website_reachable, urls.values())))
+        results["dead"] = [name for name, ok in reachable.items() if not ok]
+    worker = threading.Thread(target=check_all, daemon=True)
+    worker.start()
+    recheck_running = True
+    recheck_selected_button.configure(state="disabled", text="Vérification...")
+
+    def poll():
+        global recheck_running
+        if worker.is_alive():
+            app.after(100, poll)
+            return
+        recheck_running = False
+        recheck_selected_button.configure(text="Vérifier")
+        finish_recheck(is_folder, names, results.get("dead", []))
+    app.after(100, poll)
+
+def finish_recheck(is_folder, names, dead):
+    """
+    Ne garde sélectionnés que les favoris inaccessibles et affiche un résumé.
+    La sélection a pu changer pendant la vérification : seuls les favoris inaccessibles encore
+    sélectionnés (et non supprimés entre-temps) le restent.
+    """
+    favorites = favorite_folders if is_folder else favorite_websites
+    selected_favorites[is_folder] = selected_favorites[is_folder].intersection(dead, favorites)
+    refresh_selection_boxes(is_folder)
+    messagebox.showinfo("Vérification terminée",
+                        f"{len(dead)} favori(s) inaccessible(s) sur {len(names)} vérifié(s)."
+                        + (" Ils restent sélectionnés." if dead else ""))
+
 # --- Fonctions appelant la fenêtre modale FavoriteDialog ---
 def add_favorite_entry(is_folder): # Renommé pour éviter la confusion
     """
@@ -390,15 +1061,12 @@ def add_favorite_entry(is_folder): # Renommé pour éviter la confusion
             if name in favorite_folders:
                 messagebox.showwarning("Nom existant", f"Un dossier favori nommé '{name}' existe déjà. Veuillez choisir un nom différent.")
                 return
-            favorite_folders[name] = value
         else:
             if name in favorite_websites:
                 messagebox.showwarning("Nom existant", f"Un site web favori nommé '{name}' existe déjà. Veuillez choisir un nom différent.")
                 return
-            favorite_websites[name] = value
 
-        save_favorites(favorite_folders, favorite_websites) # Sauvegarde les changements
-        update_view() # Met à jour l'affichage de l'interface
+        apply_add_favorite(name, value, is_folder)
 
 def edit_favorite(old_name, old_value, is_folder):
     """
@@ -423,21 +1091,12 @@ def edit_favorite(old_name, old_value, is_folder):
             if new_name != old_name and new_name in favorite_folders:
                 messagebox.showwarning("Nom existant", f"Un dossier favori nommé '{new_name}' existe déjà. Veuillez choisir un nom différent.")
                 return
-            # Si le nom a changé, supprime l'ancien et ajoute le nouveau
-            if new_name != old_name:
-                del favorite_folders[old_name]
-            favorite_folders[new_name] = new_value
         else:
             if new_name != old_name and new_name in favorite_websites:
                 messagebox.showwarning("Nom existant", f"Un site web favori nommé '{new_name}' existe déjà. Veuillez choisir un nom différent.")
                 return
-            # Si le nom a changé, supprime l'ancien et ajoute le nouveau
-            if new_name != old_name:
-                del favorite_websites[old_name]
-            favorite_websites[new_name] = new_value
 
-        save_favorites(favorite_folders, favorite_websites) # Sauvegarde les changements
-        update_view() # Met à jour l'affichage
+        apply_edit_favorite(old_name, new_name, new_value, is_folder)
 
 def delete_favorite(name, is_folder):
     """
@@ -447,22 +1106,121 @@ def delete_favorite(name, is_folder):
     """
     type_text = "dossier" if is_folder else "site web"
     if messagebox.askyesno("Confirmer la suppression", f"Êtes-vous sûr de vouloir supprimer le {type_text} favori '{name}' ?"):
-        if is_folder:
-            del favorite_folders[name]
-        else:
-            del favorite_websites[name]
-        
-        save_favorites(favorite_folders, favorite_websites) # Sauvegarde les changements
-        update_view() # Met à jour l'affichage
+        apply_delete_favorite(name, is_folder)
 
 # --- Fonctions de création des boutons (avec boutons Edit/Delete) ---
+def create_favorite_row(parent_frame, name, is_folder):
+    """
+    Crée le cadre d'une ligne de favori avec sa case de sélection,
+    et l'enregistre pour les mises à jour incrémentales de l'affichage.
+    """
+    btn_frame = ctk.CTkFrame(parent_frame)
+    btn_frame.pack(fill="x", pady=2)
+
+    # Case à cocher pour la sélection multiple (actions groupées)
+    select_box = ctk.CTkCheckBox(btn_frame, text="", width=24, checkbox_width=18, checkbox_height=18)
+    select_box.configure(command=lambda n=name, b=select_box: set_favorite_selected(n, is_folder, bool(b.get())))
+    if name in selected_favorites[is_folder]:
+        select_box.select()
+    select_box.pack(side="left", padx=(5, 0))
+    btn_frame.select_box = select_box
+
+    # Poignée de glisser-déposer (ordre manuel uniquement)
+    if app_settings["sort_mode"] == "manual":
+        handle = ctk.CTkLabel(btn_frame, text="≡", width=16, cursor="fleur")
+        handle.pack(side="left", padx=(0, 4))
+        handle.bind("<ButtonPress-1>", lambda event, n=name: start_favorite_drag(n, is_folder))
+        handle.bind("<ButtonRelease-1>", end_favorite_drag)
+
+    btn_frame.favorite_name = name
+    favorite_rows[is_folder][name] = btn_frame
+    return btn_frame
+
+# --- Ordre manuel par glisser-déposer ---
+# Favori en cours de déplacement : {"name": ..., "is_folder": ...}
+drag_state = {}
+
+def start_favorite_drag(name, is_folder):
+    """Mémorise le favori saisi par sa poignée."""
+    drag_state["name"] = name
+    drag_state["is_folder"] = is_folder
+
+def end_favorite_drag(event):
+    """Dépose le favori saisi avant ou après la ligne située sous le pointeur."""
+    name = drag_state.pop("name", None)
+    is_folder = drag_state.pop("is_folder", None)
+    if name is None:
+        return
+    list_frame = folder_frame if is_folder else web_frame
+    # Remonte depuis le widget sous le pointeur jusqu'à la ligne de favori qui le contient
+    widget = app.winfo_containing(event.x_root, event.y_root)
+    while widget is not None and getattr(widget, "favorite_name", None) is None:
+        widget = widget.master
+    if widget is None or widget.master is not list_frame or widget.favorite_name == name:
+        return
+    # Moitié basse de la ligne cible : dépose après, sinon avant
+    after = event.y_root > widget.winfo_rooty() + widget.winfo_height() / 2
+    move_favorite(name, is_folder, widget.favorite_name, after)
+
+def move_favorite(name, is_folder, target_name, after):
+    """
+    Déplace un favori juste avant (ou après) un autre dans l'ordre manuel.
+    Seule la clé d'ordre du favori déplacé change (milieu des clés de ses nouveaux voisins) ;
+    l'affichage est mis à jour en re-plaçant uniquement sa ligne.
+    """
+    index = favorite_indexes[is_folder]
+    order = favorite_order[is_folder]
+    index.remove(name)
+    position = index.position(target_name) + (1 if after else 0)
+    previous_key = order[index.name_at(position - 1)] if position > 0 else None
+    next_key = order[index.name_at(position)] if position < len(index) else None
+
+    if previous_key is None and next_key is None:
+        new_key = ORDER_STEP
+    elif previous_key is None:
+        new_key = next_key - ORDER_STEP
+    elif next_key is None:
+        new_key = previous_key + ORDER_STEP
+    else:
+        new_key = (previous_key + next_key) / 2
+        if not previous_key < new_key < next_key:
+            # Précision des nombres flottants épuisée entre ces deux voisins (rare) : on ré-espace toutes les clés
+            for i, other in enumerate(index):
+                order[other] = (i + 1) * ORDER_STEP
+            new_key = order[index.name_at(position - 1)] + ORDER_STEP / 2
+            favorite_indexes[is_folder] = index = OrderIndex(list(index), make_sort_key(is_folder))
+    order[name] = new_key
+    index.insert(name)
+    save_favorites(favorite_folders, favorite_websites, order=favorite_order)
+
+    # Mise à jour incrémentale : seule la ligne déplacée est re-placée
+    rows = favorite_rows[is_folder]
+    if name in rows and target_name in rows:
+        if after:
+            rows[name].pack_configure(after=rows[target_name])
+        else:
+            rows[name].pack_configure(before=rows[target_name])
+        if not is_folder:
+            favicon_scheduler.schedule_reprioritize()
+
+def toggle_sort_mode():
+    """Bascule entre l'ordre alphabétique et l'ordre manuel (glisser-déposer)."""
+    app_settings["sort_mode"] = "manual" if app_settings["sort_mode"] == "alpha" else "alpha"
+    save_settings(app_settings)
+    rebuild_order_indexes()
+    update_sort_button()
+    update_view()
+
+def update_sort_button():
+    """Affiche le mode d'ordre courant sur son bouton."""
+    sort_button.configure(text="A→Z" if app_settings["sort_mode"] == "alpha" else "Manuel")
+
 def create_folder_button(parent_frame, name, path):
     """
     Crée un bouton CustomTkinter pour un dossier favori,
     incluant des boutons pour éditer et supprimer.
     """
-    btn_frame = ctk.CTkFrame(parent_frame)
-    btn_frame.pack(fill="x", pady=2)
+    btn_frame = create_favorite_row(parent_frame, name, True)
 
     # Bouton principal pour ouvrir le dossier
     folder_btn = ctk.CTkButton(btn_frame, text=name, command=lambda p=path: open_folder(p), anchor="w")
@@ -485,20 +1243,22 @@ def create_folder_button(parent_frame, name, path):
         delete_btn.pack(side="left", padx=2)
 
 
-def create_website_button(parent_frame, name, url):
+def create_website_button(parent_frame, name, url, index=0):
     """
     Crée un bouton CustomTkinter pour un site web favori,
     incluant un favicon si disponible et des boutons pour éditer et supprimer.
     """
-    btn_frame = ctk.CTkFrame(parent_frame)
-    btn_frame.pack(fill="x", pady=2)
+    btn_frame = create_favorite_row(parent_frame, name, False)
 
-    # Chargement asynchrone du favicon pour ne pas bloquer l'interface
-    favicon_image = load_favicon(url)
+    # Favicon déjà en cache : affiché immédiatement. Sinon, il est demandé à l'ordonnanceur
+    # (chargement en arrière-plan, lignes visibles en premier) pour ne pas bloquer l'interface.
+    favicon_image = favicon_cache.get(url)
 
     # Bouton principal pour ouvrir le site web (avec favicon si disponible)
     web_btn = ctk.CTkButton(btn_frame, text=name, command=lambda u=url: open_website(u), anchor="w", image=favicon_image, compound="left")
     web_btn.pack(side="left", fill="x", expand=True, padx=(0, 5))
+    if favicon_image is None and not favicon_recently_failed(url):
+        favicon_scheduler.request(url, btn_frame, web_btn, index)
 
     # Bouton "Modifier" (avec icône si chargée, sinon texte)
     if edit_icon:
@@ -529,11 +1289,19 @@ def update_view():
     Met à jour l'interface utilisateur pour afficher les favoris (dossiers ou sites web)
     en fonction de la variable `showing_folders`.
     """
+    # Les lignes vont être détruites : les demandes de favicons en attente n'ont plus lieu d'être
+    favicon_scheduler.cancel_all()
+
     # Détruit tous les widgets existants dans les cadres pour les recréer
     for widget in folder_frame.winfo_children():
         widget.destroy()
     for widget in web_frame.winfo_children():
         widget.destroy()
+    for is_folder, favorites in ((True, favorite_folders), (False, favorite_websites)):
+        favorite_rows[is_folder].clear()
+        # Oublie la sélection des favoris qui n'existent plus (supprimés, renommés, synchronisés)
+        selected_favorites[is_folder].intersection_update(favorites)
+    update_selection_bar()
 
     if showing_folders:
         # Configuration du bouton de bascule pour afficher "Web" (avec icône)
@@ -557,9 +1325,9 @@ def update_view():
 
         # Crée un bouton pour chaque dossier favori
         if favorite_folders:
-            sorted_folders = sorted(favorite_folders.items()) # Trie les dossiers par nom
-            for name, path in sorted_folders:
-                create_folder_button(folder_frame, name, path)
+            # Parcourt l'index trié (maintenu à chaque changement, pas de tri ici)
+            for name in favorite_indexes[True]:
+                create_folder_button(folder_frame, name, favorite_folders[name])
         else:
             # Message si aucun dossier n'est présent
             no_folders_label = ctk.CTkLabel(folder_frame, text="Aucun dossier favori ajouté.", text_color="gray")
@@ -586,14 +1354,147 @@ def update_view():
 
         # Crée un bouton pour chaque site web favori
         if favorite_websites:
-            sorted_websites = sorted(favorite_websites.items()) # Trie les sites web par nom
-            for name, url in sorted_websites:
-                create_website_button(web_frame, name, url)
+            # Parcourt l'index trié (maintenu à chaque changement, pas de tri ici)
+            for index, name in enumerate(favorite_indexes[False]):
+                create_website_button(web_frame, name, favorite_websites[name], index)
+            # Une fois la mise en page calculée, les favicons des lignes visibles passent en premier
+            favicon_scheduler.schedule_reprioritize()
         else:
             # Message si aucun site web n'est présent
             no_websites_label = ctk.CTkLabel(web_frame, text="Aucun site web favori ajouté.", text_color="gray")
             no_websites_label.pack(pady=20)
 
+# --- Application du thème de couleur à chaud (sans reconstruire les widgets) ---
+# ctk.set_default_color_theme() ne s'applique qu'aux widgets créés ensuite.
+# Pour éviter un update_view() complet ou un redémarrage, on parcourt l'arbre des widgets existants
+# et on remplace, par petits lots exécutés pendant les temps d'inactivité de Tk, les couleurs
+# qui provenaient de l'ancien thème par celles du nouveau.
+RESKIN_BATCH_SIZE = 150 # Nombre de widgets re-colorés par passe d'inactivité
+reskin_generation = 0   # Incrémenté à chaque changement de thème pour annuler une passe en cours
+appearance_generation = 0 # Idem pour les changements de mode d'apparence
+
+def get_theme_section(widget):
+    """Retourne le nom de la section du thème CustomTkinter qui s'applique au widget (ou None)."""
+    for cls in type(widget).__mro__:
+        if cls.__name__ in ctk.ThemeManager.theme:
+            return cls.__name__
+    return None
+
+def reskin_widget(widget, old_theme, new_theme):
+    """
+    Remplace sur un widget existant les couleurs de l'ancien thème par celles du nouveau.
+    Les couleurs choisies explicitement (ex: "transparent", "gray") ne correspondent à aucune
+    valeur de l'ancien thème et sont donc conservées.
+    """
+    if isinstance(widget, ctk.CTkScrollableFrame):
+        # Le cadre défilant délègue ses couleurs à un CTkFrame interne (déjà traité, car parcouru avant) :
+        # on resynchronise seulement la couleur de son canevas, comme lors d'un changement de mode.
+        widget._set_appearance_mode(ctk.get_appearance_mode().lower())
+        return
+
+    section = get_theme_section(widget)
+    if section is None or section not in old_theme:
+        return
+    old_colors = old_theme[section]
+    new_colors = new_theme.get(section, {})
+
+    changes = {}
+    for key, new_value in new_colors.items():
+        old_value = old_colors.get(key)
+        if old_value is None or old_value == new_value or not isinstance(new_value, (str, list, tuple)):
+            continue # Clé absente, inchangée ou non colorimétrique (corner_radius, border_width...)
+        # La couleur "top_fg_color" d'un cadre imbriqué est stockée dans son fg_color
+        option = "fg_color" if key == "top_fg_color" else key
+        if getattr(widget, "_" + option, None) == old_value:
+            changes[option] = new_value
+
+    for option, value in changes.items():
+        try:
+            widget.configure(**{option: value})
+        except (ValueError, tk.TclError):
+            pass # Option non prise en charge par ce widget : on l'ignore
+
+def apply_color_theme_live(new_color_theme):
+    """
+    Charge un nouveau thème de couleur et re-colore les widgets existants en place,
+    par lots, pendant les temps d'inactivité de la boucle Tk.
+    """
+    global reskin_generation
+    old_theme = ctk.ThemeManager.theme # load_theme() remplace le dictionnaire : l'ancien reste intact
+    ctk.set_default_color_theme(new_color_theme)
+    new_theme = ctk.ThemeManager.theme
+
+    reskin_generation += 1
+    generation = reskin_generation
+
+    # Parcours en largeur : un parent est toujours re-coloré avant ses enfants,
+    # ce qui permet à CustomTkinter de propager correctement les bg_color.
+    pending = [app]
+    index = 0
+
+    def process_batch():
+        nonlocal index
+        if generation != reskin_generation:
+            return # Un thème plus récent a été demandé entre-temps
+        end = index + RESKIN_BATCH_SIZE
+        while index < len(pending) and index < end:
+            widget = pending[index]
+            index += 1
+            try:
+                if not widget.winfo_exists():
+                    continue # Widget détruit depuis le début de la passe
+                reskin_widget(widget, old_theme, new_theme)
+                pending.extend(widget.winfo_children())
+            except tk.TclError:
+                continue
+        if index < len(pending):
+            app.after_idle(process_batch)
+
+    process_batch()
+
+def apply_appearance_mode_live(new_mode):
+    """
+    Change le mode d'apparence ("dark", "light" ou "system") en re-dessinant les widgets par lots,
+    pendant les temps d'inactivité de la boucle Tk.
+    ctk.set_appearance_mode() appelle d'un coup le rappel de chaque widget enregistré auprès
+    d'AppearanceModeTracker ; on met à jour l'état du tracker nous-mêmes, puis on appelle ces
+    mêmes rappels par lots de RESKIN_BATCH_SIZE, dans leur ordre de création (parents avant enfants).
+    """
+    global appearance_generation
+    tracker = ctk.AppearanceModeTracker
+    if new_mode == "system":
+        tracker.appearance_mode_set_by = "system"
+        mode = tracker.detect_appearance_mode()
+    else:
+        tracker.appearance_mode_set_by = "user"
+        mode = 1 if new_mode == "dark" else 0
+
+    appearance_generation += 1
+    generation = appearance_generation
+    if mode == tracker.appearance_mode:
+        return # Déjà dans ce mode : rien à re-dessiner
+    # Les widgets créés à partir d'ici prennent directement le nouveau mode ;
+    # la boucle de détection du mode système ne voit plus de changement à appliquer.
+    tracker.appearance_mode = mode
+    mode_string = "Dark" if mode == 1 else "Light"
+    callbacks = list(tracker.callback_list)
+    index = 0
+
+    def process_batch():
+        nonlocal index
+        if generation != appearance_generation:
+            return # Un mode plus récent a été demandé entre-temps
+        for callback in callbacks[index:index + RESKIN_BATCH_SIZE]:
+            try:
+                callback(mode_string)
+            except Exception:
+                continue # Widget détruit depuis le début de la passe (même tolérance que CustomTkinter)
+        index += RESKIN_BATCH_SIZE
+        if index < len(callbacks):
+            app.after_idle(process_batch)
+
+    process_batch()
+
 # --- Classe pour la boîte de dialogue des paramètres de thème ---
 class ThemeSettingsDialog(ctk.CTkToplevel):
     """
@@ -661,19 +1562,19 @@ class ThemeSettingsDialog(ctk.CTkToplevel):
         new_mode = self.mode_var.get()
         new_color = self.color_combobox.get() # Utiliser .get() sur le combobox
 
-        # Applique le mode d'apparence choisi
-        ctk.set_appearance_mode(new_mode)
-        # Applique le thème de couleur choisi (toujours un thème intégré)
-        ctk.set_default_color_theme(new_color)
+        # Applique le mode d'apparence choisi aux widgets existants, par lots
+        if new_mode != app_settings["appearance_mode"]:
+            apply_appearance_mode_live(new_mode)
+        # Applique le thème de couleur choisi (toujours un thème intégré) aux widgets existants
+        if new_color != app_settings["color_theme"]:
+            apply_color_theme_live(new_color)
 
         # Met à jour les paramètres de l'application et les sauvegarde
         app_settings["appearance_mode"] = new_mode
         app_settings["color_theme"] = new_color
         save_settings(app_settings)
 
-        # Forcer le rafraîchissement de l'interface pour appliquer les changements de thème
-        app.update_idletasks()
-        app.update()
+        # Pas de rafraîchissement forcé : la re-coloration se poursuit par lots pendant l'inactivité
         self.destroy() # Ferme la boîte de dialogue
 
     def on_cancel(self):
@@ -759,6 +1660,15 @@ else:
     theme_button = ctk.CTkButton(top_frame, text="Thème", command=open_theme_settings_dialog)
     theme_button.pack(side="right", padx=5)
 
+# Bouton pour choisir le dossier partagé de synchronisation entre postes
+sync_button = ctk.CTkButton(top_frame, text="Sync", command=choose_sync_directory, width=50)
+sync_button.pack(side="right", padx=5)
+
+# Bouton pour basculer entre l'ordre alphabétique et l'ordre manuel (glisser-déposer)
+sort_button = ctk.CTkButton(top_frame, text="", command=toggle_sort_mode, width=60)
+sort_button.pack(side="right", padx=5)
+update_sort_button()
+
 # Bouton pour basculer entre l'affichage des dossiers et des sites web
 # La configuration de l'icône et du texte se fera dans update_view()
 toggle_button = ctk.CTkButton(top_frame, text="", command=toggle_view, compound="left")
@@ -777,6 +1687,19 @@ else:
                                command=open_add_favorite_choice_dialog)
 add_button.pack(expand=True) # Utilise expand=True pour le centrer dans add_button_frame
 
+# --- Barre des actions groupées sur la sélection (cases à cocher des lignes) ---
+selection_frame = ctk.CTkFrame(app, fg_color="transparent")
+selection_frame.pack(fill="x", padx=10, pady=(0, 5))
+
+select_all_button = ctk.CTkButton(selection_frame, text="Tout", width=50, command=select_all_favorites)
+select_all_button.pack(side="left", padx=(5, 2))
+selection_label = ctk.CTkLabel(selection_frame, text="0 sélectionné(s)")
+selection_label.pack(side="left", padx=5)
+delete_selected_button = ctk.CTkButton(selection_frame, text="Supprimer", width=80, command=delete_selected_favorites)
+delete_selected_button.pack(side="right", padx=(2, 5))
+recheck_selected_button = ctk.CTkButton(selection_frame, text="Vérifier", width=80, command=recheck_selected_favorites)
+recheck_selected_button.pack(side="right", padx=2)
+
 # --- Section pour les dossiers favoris ---
 # Cadre défilant pour contenir les boutons des dossiers
 folder_frame = ctk.CTkScrollableFrame(app, label_text="")
@@ -785,10 +1708,22 @@ folder_frame = ctk.CTkScrollableFrame(app, label_text="")
 # Cadre défilant pour contenir les boutons des sites web
 web_frame = ctk.CTkScrollableFrame(app, label_text="")
 
+# Ordonnanceur des favicons : re-priorise les demandes à chaque défilement de la liste des sites web
+favicon_scheduler = FaviconScheduler(app, web_frame)
+def on_web_frame_scroll(first, last):
+    """Met à jour la barre de défilement puis re-priorise les favicons selon la nouvelle zone visible."""
+    web_frame._scrollbar.set(first, last)
+    favicon_scheduler.schedule_reprioritize()
+web_frame._parent_canvas.configure(yscrollcommand=on_web_frame_scroll)
+
 # --- Affichage initial ---
 # Variable globale pour savoir quel type de favoris est actuellement affiché
 showing_folders = True
 update_view() # Appelle la fonction pour afficher les favoris au démarrage
+# Synchronisation périodique avec les autres postes (si un dossier partagé est configuré)
+app.after(SYNC_INTERVAL_MS, schedule_sync)
 
 # --- Lancement de l'application ---
-app.mainloop()
\ No newline at end of file
+# (pas de boucle principale lorsque le script est chargé comme module, ex: par fav_memcheck.py)
+if __name__ == "__main__":
+    app.mainloop()
\ No newline at end of file
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+
+# Banc de mesure de l'empreinte mémoire et de détection de fuites de Fav-Me.
+#
+# Charge fav-v2.1.py comme module avec une fenêtre Tk cachée et des données dans un dossier
+# temporaire (les vrais favoris ne sont jamais touchés), puis enchaîne des milliers de cycles
+# ajout / modification / suppression / bascule de vue en passant par les mêmes fonctions que l'interface.
+#
+# Mesures :
+# - mémoire Python allouée (tracemalloc) et octets par favori affiché ;
+# - nombre de widgets Tk vivants, de commandes Tcl enregistrées et d'objets widget Python.
+#
+# Le script échoue (code de sortie 1) si la mémoire ou le nombre de widgets augmente au fil des cycles.
+# Utilisation : python fav_memcheck.py [--favorites 200] [--cycles 3000]
+# (sans écran : xvfb-run python fav_memcheck.py)
+
+import argparse
+import gc
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import tkinter as tk
+import tracemalloc
+
+from PIL import Image
+
+# Croissance mémoire tolérée (octets par cycle) une fois l'application stabilisée
+MAX_GROWTH_BYTES_PER_CYCLE = 128
+# Cycles exécutés avant la mesure de référence (remplissage des caches, pools internes...)
+WARMUP_CYCLES = 50
+# Délai maximal d'attente des favicons demandés par l'ordonnanceur (secondes)
+FAVICON_TIMEOUT_S = 5
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fav-v2.1.py")
+
+
+def load_app(data_dir):
+    """Charge le script de l'application comme module, sans boucle principale, avec une fenêtre cachée."""
+    os.environ["FAVME_DATA_DIR"] = data_dir
+    spec = importlib.util.spec_from_file_location("favme", APP_SCRIPT)
+    favme = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(favme)
+    favme.app.withdraw()
+    # Favicons générés localement : le banc ne dépend pas du réseau mais remplit bien le cache
+    favme.fetch_favicon_image = lambda url, size=(16, 16): Image.new("RGBA", size, (200, 80, 80, 255))
+    return favme
+
+def settle(favme):
+    """Traite les événements en attente (mise en page, favicons téléchargés, re-coloration...)."""
+    for _ in range(3):
+        favme.app.update()
+        time.sleep(favme.FAVICON_POLL_MS / 1000)
+    favme.app.update()
+
+def wait_for_favicons(favme):
+    """
+    Laisse l'ordonnanceur traiter toutes les demandes de favicons en cours (priorisation, téléchargement,
+    mise en cache). Retourne False si elles ne sont pas terminées après FAVICON_TIMEOUT_S secondes.
+    """
+    scheduler = favme.favicon_scheduler
+    deadline = time.monotonic() + FAVICON_TIMEOUT_S
+    while time.monotonic() < deadline:
+        favme.app.update()
+        with scheduler.condition:
+            busy = bool(scheduler.pending or scheduler.in_flight)
+        if not busy and scheduler.results.empty():
+            return True
+        time.sleep(favme.FAVICON_POLL_MS / 1000)
+    return False
+
+def count_tk_widgets(app):
+    """Compte tous les widgets Tk vivants (y compris les canevas internes de CustomTkinter)."""
+    count = 0
+    pending = [str(app)]
+    while pending:
+        path = pending.pop()
+        children = app.tk.splitlist(app.tk.call("winfo", "children", path))
+        count += len(children)
+        pending.extend(children)
+    return count
+
+def measure(favme):
+    """Retourne un relevé : mémoire Python, widgets Tk, commandes Tcl et objets widget Python."""
+    settle(favme)
+    gc.collect()
+    return {
+        "memory": tracemalloc.get_traced_memory()[0],
+        "widgets": count_tk_widgets(favme.app),
+        "tcl_commands": len(favme.app.tk.splitlist(favme.app.tk.call("info", "commands"))),
+        "python_widgets": sum(1 for obj in gc.get_objects() if isinstance(obj, tk.Misc)),
+        "favicon_cache": len(favme.favicon_cache),
+    }
+
+def run_cycle(favme, i, folder_path):
+    """
+    Un cycle, commencé et terminé sur la vue des dossiers :
+    ajout d'un dossier, bascule vers les sites web, ajout d'un site puis modification (renommage +
+    nouvelle URL) avec chargement de son favicon à chaque étape, suppressions, retour aux dossiers.
+    Le nombre de favoris est identique en fin de cycle ; les favicons du site doivent avoir été
+    mis en cache puis retirés du cache.
+    Retourne True si les deux favicons du site ont bien été chargés.
+    """
+    url = f"https://cycle-{i}.example"
+    new_url = f"https://cycle-{i}-bis.example"
+    favme.apply_add_favorite(f"cycle-dossier-{i}", folder_path, True)
+    favme.toggle_view() # Liste des sites web : les lignes du cycle sont affichées
+    favme.apply_add_favorite(f"cycle-site-{i}", url, False)
+    loaded = wait_for_favicons(favme) and url in favme.favicon_cache
+    favme.apply_edit_favorite(f"cycle-site-{i}", f"cycle-site-{i}-modifié", new_url, False)
+    loaded = wait_for_favicons(favme) and new_url in favme.favicon_cache and loaded
+    favme.apply_delete_favorite(f"cycle-site-{i}-modifié", False)
+    favme.toggle_view()
+    favme.apply_delete_favorite(f"cycle-dossier-{i}", True)
+    favme.app.update()
+    return loaded
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc de mesure mémoire et de détection de fuites de Fav-Me.")
+    parser.add_argument("--favorites", type=int, default=200, help="Nombre de dossiers et de sites web initiaux")
+    parser.add_argument("--cycles", type=int, default=3000, help="Nombre de cycles ajout/modification/suppression/bascule")
+    args = parser.parse_args()
+
+    # Dossier de données supprimé en fin de banc, y compris en cas d'erreur
+    with tempfile.TemporaryDirectory(prefix="favme-memcheck-") as data_dir:
+        tracemalloc.start()
+        try:
+            favme = load_app(data_dir)
+        except tk.TclError as e:
+            print(f"Impossible de créer une fenêtre Tk (aucun affichage disponible ?) : {e}")
+            return 2
+        try:
+            return run_benchmark(favme, args, data_dir)
+        finally:
+            favme.app.destroy() # Libère la fenêtre avant la suppression du dossier
+
+def run_benchmark(favme, args, data_dir):
+    """Mesure le coût par favori puis enchaîne les cycles ; retourne le code de sortie (0 : OK, 1 : fuite)."""
+    # --- Coût par favori : données + ligne affichée, mesuré séparément pour chaque type ---
+    before = measure(favme)
+    for i in range(args.favorites):
+        favme.favorite_folders[f"dossier-{i:05d}"] = data_dir
+    favme.rebuild_order_indexes() # Favoris ajoutés directement : index triés à reconstruire
+    favme.update_view()
+    with_folders = measure(favme)
+
+    favme.favorite_folders.clear()
+    for i in range(args.favorites):
+        favme.favorite_websites[f"site-{i:05d}"] = f"https://site-{i}.example"
+    favme.rebuild_order_indexes()
+    favme.toggle_view() # Affiche les sites web
+    with_websites = measure(favme)
+
+    # Collection complète pour les cycles
+    for i in range(args.favorites):
+        favme.favorite_folders[f"dossier-{i:05d}"] = data_dir
+    favme.rebuild_order_indexes()
+    favme.save_favorites(favme.favorite_folders, favme.favorite_websites, order=favme.favorite_order)
+    favme.toggle_view()
+
+    count = max(args.favorites, 1)
+    print(f"Favoris initiaux : {args.favorites} dossiers, {args.favorites} sites web")
+    print(f"Octets par dossier affiché    : {(with_folders['memory'] - before['memory']) / count:,.0f}")
+    print(f"Octets par site web affiché   : {(with_websites['memory'] - before['memory']) / count:,.0f} (favicon compris)")
+    print(f"Widgets Tk par ligne affichée : {(with_folders['widgets'] - before['widgets']) / count:.1f}")
+
+    # --- Cycles ---
+    not_loaded = 0 # Cycles dont le favicon n'a pas été chargé (la vérification du cache serait sans objet)
+    for i in range(WARMUP_CYCLES):
+        not_loaded += not run_cycle(favme, i, data_dir)
+    baseline = measure(favme)
+    report_every = max(args.cycles // 10, 1)
+    for i in range(WARMUP_CYCLES, WARMUP_CYCLES + args.cycles):
+        not_loaded += not run_cycle(favme, i, data_dir)
+        if (i - WARMUP_CYCLES + 1) % report_every == 0:
+            sample = measure(favme)
+            print(f"  cycle {i - WARMUP_CYCLES + 1:>6} : mémoire {sample['memory']:>12,} o, "
+                  f"widgets {sample['widgets']:>6}, commandes Tcl {sample['tcl_commands']:>6}, "
+                  f"cache favicons {sample['favicon_cache']}")
+    final = measure(favme)
+
+    # --- Verdict ---
+    failures = []
+    if not_loaded:
+        failures.append(f"favicons non chargés dans {not_loaded} cycle(s)")
+    growth_per_cycle = (final["memory"] - baseline["memory"]) / max(args.cycles, 1)
+    print(f"Croissance mémoire : {growth_per_cycle:,.1f} o/cycle (tolérance {MAX_GROWTH_BYTES_PER_CYCLE} o/cycle)")
+    if growth_per_cycle > MAX_GROWTH_BYTES_PER_CYCLE:
+        failures.append(f"la mémoire augmente de {growth_per_cycle:,.1f} octets par cycle")
+    for key, label in (("widgets", "widgets Tk"), ("tcl_commands", "commandes Tcl"),
+                       ("python_widgets", "objets widget Python"), ("favicon_cache", "favicons en cache")):
+        if final[key] > baseline[key]:
+            failures.append(f"{label} : {baseline[key]} -> {final[key]}")
+
+    if failures:
+        print("ÉCHEC : fuite détectée")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("OK : aucune croissance détectée")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
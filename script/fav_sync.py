@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+
+# Synchronisation des favoris entre plusieurs postes via un dossier partagé
+# (partage réseau, dossier synchronisé type Nextcloud/OneDrive...).
+#
+# Principe :
+# - Chaque poste (pair) n'écrit QUE dans ses propres journaux : <dossier>/ops-<pair>-<segment>.jsonl.
+#   Chaque ligne est une opération (ajout/modification ou suppression d'un favori).
+#   Aucun fichier n'est donc jamais écrit par deux postes à la fois (instantanés compris, voir plus bas).
+# - Chaque pair mémorise, pour les autres pairs, la position (segment, octet) jusqu'où il a lu.
+#   Une synchronisation ne lit que les nouvelles lignes : son coût dépend du nombre de changements,
+#   pas de la taille de la collection.
+# - Les conflits (même favori modifié sur deux postes) sont résolus par "dernière écriture gagnante"
+#   grâce à un horodatage (heure, pair, numéro de séquence) conservé pour chaque favori.
+# - Périodiquement, un pair écrit SON instantané (snapshot-<pair>.json) de l'état fusionné, puis
+#   supprime ses anciens segments, désormais couverts par cet instantané. Avant de lire les journaux,
+#   un pair fusionne chaque instantané des autres pairs apparu ou modifié depuis sa dernière lecture.
+# - L'état local d'un pair (progression, horodatage de chaque favori) est un journal local : chaque
+#   sauvegarde n'ajoute qu'une ligne avec les compteurs et les favoris modifiés ; le fichier n'est
+#   réécrit en entier qu'au compactage ou quand il a trop grandi.
+#
+# Ce module n'utilise ni Tkinter ni le réseau : il peut être testé avec deux dossiers locaux.
+
+import hashlib
+import json
+import os
+import time
+import uuid
+
+# Types de favoris synchronisés (mêmes clés que dans favorites_config.json)
+SYNC_KINDS = ("folders", "websites")
+# Nombre d'opérations écrites par ce pair avant de déclencher un compactage (instantané)
+COMPACT_EVERY = 500
+# Nombre de lignes du fichier d'état local avant sa réécriture complète (point de reprise)
+STATE_CHECKPOINT_EVERY = 500
+SNAPSHOT_PREFIX = "snapshot-"
+
+
+def state_file_for(state_dir, shared_dir):
+    """Retourne le fichier d'état local propre à un dossier partagé (un état par dossier)."""
+    digest = hashlib.sha1(os.path.abspath(shared_dir).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(state_dir, f"sync_state-{digest}.jsonl")
+
+def _read_json(path, default):
+    """Lit un fichier JSON, ou retourne `default` s'il est absent ou illisible."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return default
+
+def _write_text_atomic(path, text):
+    """Écrit un fichier texte de façon atomique (fichier temporaire puis remplacement)."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def _write_json_atomic(path, data):
+    """Écrit un fichier JSON de façon atomique."""
+    _write_text_atomic(path, json.dumps(data))
+
+
+class SyncLog:
+    """
+    Journal d'opérations partagé d'un pair.
+    :param shared_dir: Le dossier partagé entre les postes.
+    :param state_file: Le fichier local où ce pair mémorise son identité et sa progression
+                       (un fichier distinct par dossier partagé, voir state_file_for).
+    """
+    def __init__(self, shared_dir, state_file):
+        self.shared_dir = shared_dir
+        self.state_file = state_file
+        os.makedirs(shared_dir, exist_ok=True)
+
+        state, entries, lines = self._read_state()
+        # Un état local ne vaut que pour le dossier partagé avec lequel il a été construit.
+        # S'il est absent ou ne correspond pas, ce poste repart avec une NOUVELLE identité : réutiliser
+        # l'ancienne ferait repartir les numéros de séquence à 1, et les autres pairs (qui ont déjà
+        # vu des numéros plus élevés pour cette identité) ignoreraient toutes les nouvelles opérations.
+        if state.get("shared_dir") != os.path.abspath(shared_dir) or not state.get("peer_id"):
+            state = {"peer_id": uuid.uuid4().hex[:12]}
+            entries = {kind: {} for kind in SYNC_KINDS}
+            lines = None # Le fichier d'état sera réécrit entièrement à la première sauvegarde
+        self.peer_id = state["peer_id"]
+        self.next_seq = state.get("next_seq", 1)
+        self.segment = state.get("segment", 0)
+        self.ops_in_segment = state.get("ops_in_segment", 0)
+        # Dernier numéro de séquence appliqué pour chaque pair
+        self.clock = state.get("clock", {})
+        # Position de lecture [segment, octet] dans les journaux de chaque autre pair
+        self.cursors = state.get("cursors", {})
+        # Version [date de modification, taille] du dernier instantané fusionné de chaque autre pair
+        self.snapshot_versions = state.get("snapshots", {})
+        # État répliqué : {type: {nom: {"stamp": [heure, pair, seq], "value": valeur ou None}}}
+        self.entries = entries
+        # Entrées modifiées depuis la dernière sauvegarde : {(type, nom): entrée}
+        self.dirty_entries = {}
+        # Lignes du fichier d'état depuis sa dernière réécriture complète (None : réécriture à faire)
+        self.state_lines = lines
+
+    # --- Persistance de l'état local ---
+    def _read_state(self):
+        """
+        Relit le fichier d'état local : chaque ligne porte les compteurs à jour et les entrées
+        modifiées, appliquées dans l'ordre. Retourne (compteurs, entrées, nombre de lignes).
+        """
+        state, entries, lines = {}, {kind: {} for kind in SYNC_KINDS}, 0
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        if not line.endswith("\n"):
+                            raise ValueError("ligne incomplète")
+                        record = json.loads(line)
+                        changes = [(kind, name, entry) for kind, name, entry in record["entries"]]
+                        state = record["state"]
+                    except (ValueError, KeyError, TypeError):
+                        break # Sauvegarde interrompue (arrêt brutal) : la ligne et la suite sont ignorées
+                    for kind, name, entry in changes:
+                        entries.setdefault(kind, {})[name] = entry
+                    lines += 1
+        except OSError:
+            pass
+        return state, entries, lines
+
+    def _state_record(self, entries):
+        """Construit une ligne du fichier d'état : les compteurs et les entrées données."""
+        return json.dumps({
+            "state": {
+                "shared_dir": os.path.abspath(self.shared_dir),
+                "peer_id": self.peer_id,
+                "next_seq": self.next_seq,
+                "segment": self.segment,
+                "ops_in_segment": self.ops_in_segment,
+                "clock": self.clock,
+                "cursors": self.cursors,
+                "snapshots": self.snapshot_versions,
+            },
+            "entries": entries,
+        }) + "\n"
+
+    def save_state(self):
+        """
+        Sauvegarde la progression locale de ce pair en ajoutant une ligne au fichier d'état :
+        son coût dépend du nombre de favoris modifiés, pas de la taille de la collection.
+        """
+        if self.state_lines is None or self.state_lines >= STATE_CHECKPOINT_EVERY:
+            self.checkpoint_state()
+            return
+        changes = [[kind, name, entry] for (kind, name), entry in self.dirty_entries.items()]
+        with open(self.state_file, 'a', encoding='utf-8') as f:
+            f.write(self._state_record(changes))
+            f.flush()
+            os.fsync(f.fileno())
+        self.dirty_entries.clear()
+        self.state_lines += 1
+
+    def checkpoint_state(self):
+        """Réécrit entièrement le fichier d'état local (une seule ligne avec toutes les entrées)."""
+        changes = [[kind, name, entry] for kind, kind_entries in self.entries.items()
+                   for name, entry in kind_entries.items()]
+        _write_text_atomic(self.state_file, self._state_record(changes))
+        self.dirty_entries.clear()
+        self.state_lines = 1
+
+    def _set_entry(self, kind, name, entry):
+        """Met à jour l'entrée répliquée d'un favori (sauvegardée avec le prochain save_state)."""
+        self.entries.setdefault(kind, {})[name] = entry
+        self.dirty_entries[(kind, name)] = entry
+
+    def _segment_path(self, peer_id, segment):
+        return os.path.join(self.shared_dir, f"ops-{peer_id}-{segment:06d}.jsonl")
+
+    def _snapshot_path(self, peer_id):
+        return os.path.join(self.shared_dir, f"{SNAPSHOT_PREFIX}{peer_id}.json")
+
+    def _list_segments(self):
+        """Retourne {pair: [segments triés]} pour tous les journaux présents dans le dossier partagé."""
+        segments = {}
+        for filename in os.listdir(self.shared_dir):
+            if not (filename.startswith("ops-") and filename.endswith(".jsonl")):
+                continue
+            try:
+                peer_id, segment = filename[4:-6].rsplit("-", 1)
+                segments.setdefault(peer_id, []).append(int(segment))
+            except ValueError:
+                continue # Nom de fichier inattendu : ignoré
+        for peer_segments in segments.values():
+            peer_segments.sort()
+        return segments
+
+    # --- Application des opérations (dernière écriture gagnante) ---
+    def _apply(self, op, folders, websites):
+        """
+        Applique une opération à l'état répliqué et aux dictionnaires de favoris.
+        Retourne True si les favoris ont changé.
+        """
+        kind, name, stamp = op["kind"], op["name"], op["stamp"]
+        if kind not in SYNC_KINDS:
+            return False
+        current = self.entries.setdefault(kind, {}).get(name)
+        if current is not None and current["stamp"] >= stamp:
+            return False # Une modification plus récente de ce favori est déjà connue
+
+        value = op.get("value") if op["op"] == "set" else None
+        self._set_entry(kind, name, {"stamp": stamp, "value": value})
+        target = folders if kind == "folders" else websites
+        if value is None:
+            return target.pop(name, None) is not None
+        if target.get(name) == value:
+            return False
+        target[name] = value
+        return True
+
+    # --- Enregistrement des changements locaux ---
+    def record_many(self, changes):
+        """
+        Enregistre plusieurs changements locaux en une seule écriture du journal.
+        :param changes: Liste de (type, nom, valeur) ; une valeur None signifie une suppression.
+        """
+        if not changes:
+            return
+        lines = []
+        for kind, name, value in changes:
+            seq = self.next_seq
+            self.next_seq += 1
+            entry = {"op": "set" if value is not None else "delete", "kind": kind, "name": name,
+                     "stamp": [time.time(), self.peer_id, seq]}
+            if value is not None:
+                entry["value"] = value
+            lines.append(json.dumps(entry) + "\n")
+            self.clock[self.peer_id] = seq
+            # Le changement est déjà présent dans les dictionnaires locaux : on met à jour l'état répliqué seulement
+            self._set_entry(kind, name, {"stamp": entry["stamp"], "value": value})
+        with open(self._segment_path(self.peer_id, self.segment), 'a', encoding='utf-8') as f:
+            f.write("".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        self.ops_in_segment += len(lines)
+        self.save_state()
+
+    def record_set(self, kind, name, value):
+        """Enregistre l'ajout ou la modification d'un favori."""
+        self.record_many([(kind, name, value)])
+
+    def record_delete(self, kind, name):
+        """Enregistre la suppression d'un favori."""
+        self.record_many([(kind, name, None)])
+
+    def publish_missing(self, folders, websites):
+        """
+        Publie les favoris locaux encore inconnus du journal partagé
+        (première activation de la synchronisation sur un poste).
+        """
+        changes = []
+        for kind, source in (("folders", folders), ("websites", websites)):
+            known = self.entries.get(kind, {})
+            changes.extend((kind, name, value) for name, value in source.items() if name not in known)
+        self.record_many(changes)
+
+    # --- Récupération des changements des autres pairs ---
+    def _merge_snapshots(self, folders, websites):
+        """
+        Fusionne les instantanés des autres pairs apparus ou modifiés depuis la dernière lecture.
+        Retourne (nombre de favoris modifiés, True si au moins un instantané a été fusionné).
+        """
+        changed = 0
+        merged = False
+        for filename in os.listdir(self.shared_dir):
+            if not (filename.startswith(SNAPSHOT_PREFIX) and filename.endswith(".json")):
+                continue
+            peer_id = filename[len(SNAPSHOT_PREFIX):-5]
+            if peer_id == self.peer_id:
+                continue
+            path = self._snapshot_path(peer_id)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            version = [stat.st_mtime_ns, stat.st_size]
+            if self.snapshot_versions.get(peer_id) == version:
+                continue # Déjà fusionné
+            snapshot = _read_json(path, None)
+            if not snapshot:
+                continue # Illisible pour l'instant : réessayé à la prochaine synchronisation
+            changed += self._load_snapshot(peer_id, snapshot, folders, websites)
+            self.snapshot_versions[peer_id] = version
+            merged = True
+        return changed, merged
+
+    def _load_snapshot(self, peer_id, snapshot, folders, websites):
+        """Fusionne l'instantané d'un pair dans l'état local. Retourne le nombre de favoris modifiés."""
+        changed = 0
+        for kind, snapshot_entries in snapshot.get("entries", {}).items():
+            for name, entry in snapshot_entries.items():
+                op = {"op": "set" if entry["value"] is not None else "delete",
+                      "kind": kind, "name": name, "stamp": entry["stamp"], "value": entry["value"]}
+                if self._apply(op, folders, websites):
+                    changed += 1
+        # Les segments de ce pair antérieurs à l'instantané ont pu être supprimés : ils sont couverts
+        self.clock[peer_id] = max(self.clock.get(peer_id, 0), snapshot.get("seq", 0))
+        covered = [snapshot.get("segment", 0), 0]
+        if covered > self.cursors.get(peer_id, [0, 0]):
+            self.cursors[peer_id] = covered
+        return changed
+
+    def pull(self, folders, websites):
+        """
+        Rejoue les opérations des autres pairs que ce poste n'a pas encore vues.
+        Les dictionnaires `folders` et `websites` sont modifiés en place.
+        Retourne le nombre de favoris modifiés.
+        """
+        # Un instantané nouveau ou modifié signifie que des segments ont pu être supprimés :
+        # les instantanés sont donc fusionnés avant la lecture des journaux
+        changed, merged = self._merge_snapshots(folders, websites)
+        segments = self._list_segments()
+        segments.pop(self.peer_id, None)
+
+        moved = False
+        for peer_id, peer_segments in segments.items():
+            cursor_segment, cursor_offset = self.cursors.get(peer_id, [0, 0])
+            for segment in peer_segments:
+                if segment < cursor_segment:
+                    continue
+                offset = cursor_offset if segment == cursor_segment else 0
+                try:
+                    with open(self._segment_path(peer_id, segment), 'rb') as f:
+                        f.seek(offset)
+                        for line in f:
+                            if not line.endswith(b"\n"):
+                                break # Ligne en cours d'écriture par l'autre poste : relue plus tard
+                            offset += len(line)
+                            try:
+                                op = json.loads(line)
+                            except ValueError:
+                                continue
+                            seq = op["stamp"][2]
+                            if seq <= self.clock.get(peer_id, 0):
+                                continue # Déjà appliquée (via l'instantané par exemple)
+                            self.clock[peer_id] = seq
+                            if self._apply(op, folders, websites):
+                                changed += 1
+                except OSError:
+                    continue # Segment supprimé entre-temps
+                if [segment, offset] != [cursor_segment, cursor_offset]:
+                    moved = True
+                cursor_segment, cursor_offset = segment, offset
+            self.cursors[peer_id] = [cursor_segment, cursor_offset]
+
+        if merged:
+            self.checkpoint_state() # Beaucoup d'entrées ont pu changer d'un coup
+        elif changed or moved or self.dirty_entries:
+            self.save_state()
+        return changed
+
+    # --- Compactage ---
+    def needs_compaction(self):
+        """Indique si ce pair a écrit assez d'opérations pour justifier un nouvel instantané."""
+        return self.ops_in_segment >= COMPACT_EVERY
+
+    def compact(self, folders, websites):
+        """
+        Écrit l'instantané de ce pair (état fusionné) puis supprime ses anciens segments.
+        Seul ce pair écrit son instantané ; les autres pairs le fusionnent à leur prochaine lecture.
+        Les changements des autres pairs sont récupérés au passage : retourne, comme pull(),
+        le nombre de favoris modifiés.
+        """
+        changed = self.pull(folders, websites)
+
+        # Les prochaines opérations de ce pair iront dans un nouveau segment. L'état local est
+        # sauvegardé avant l'instantané : après un arrêt brutal, ce pair n'écrira jamais dans un
+        # segment que son instantané déclare couvert.
+        self.segment += 1
+        self.ops_in_segment = 0
+        self.checkpoint_state()
+        _write_json_atomic(self._snapshot_path(self.peer_id), {
+            "peer_id": self.peer_id,
+            "segment": self.segment,       # Premier segment NON couvert par cet instantané
+            "seq": self.next_seq - 1,      # Dernière opération de ce pair couverte
+            "entries": self.entries,
+        })
+        # L'instantané couvre maintenant les anciens segments de ce pair : ils peuvent être supprimés
+        for segment in self._list_segments().get(self.peer_id, []):
+            if segment < self.segment:
+                try:
+                    os.remove(self._segment_path(self.peer_id, segment))
+                except OSError:
+                    pass
+        return changed
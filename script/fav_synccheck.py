@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+# Vérification de la synchronisation (fav_sync.SyncLog) avec des dossiers locaux.
+#
+# Chaque scénario crée un dossier partagé et un dossier d'état par poste dans un dossier temporaire,
+# puis simule plusieurs postes dans le même processus : récupération des changements, suppressions
+# (pierres tombales), compactage, poste arrivé tardivement, redémarrage d'un poste.
+#
+# Le script échoue (code de sortie 1) si un scénario ne donne pas les favoris attendus.
+# Utilisation : python fav_synccheck.py
+
+import os
+import sys
+import tempfile
+
+import fav_sync
+
+
+class Peer:
+    """Un poste simulé : ses favoris et son journal de synchronisation."""
+    def __init__(self, root, name):
+        self.root = root
+        self.name = name
+        self.folders = {}
+        self.websites = {}
+        self.log = None
+        self.open()
+
+    def open(self):
+        """(Re)démarre le poste avec son état local, comme au lancement de l'application."""
+        state_dir = os.path.join(self.root, f"etat-{self.name}")
+        os.makedirs(state_dir, exist_ok=True)
+        shared_dir = os.path.join(self.root, "partage")
+        self.log = fav_sync.SyncLog(shared_dir, fav_sync.state_file_for(state_dir, shared_dir))
+
+    def add(self, name, url):
+        self.websites[name] = url
+        self.log.record_set("websites", name, url)
+
+    def delete(self, name):
+        self.websites.pop(name, None)
+        self.log.record_delete("websites", name)
+
+    def pull(self):
+        return self.log.pull(self.folders, self.websites)
+
+    def compact(self):
+        return self.log.compact(self.folders, self.websites)
+
+
+def expect(failures, label, actual, expected):
+    """Compare une valeur obtenue à la valeur attendue et consigne l'écart éventuel."""
+    if actual != expected:
+        failures.append(f"{label} : obtenu {actual!r}, attendu {expected!r}")
+
+def check_pull_and_tombstone(root, failures):
+    """Un ajout puis une suppression sur A sont rejoués sur B."""
+    a, b = Peer(root, "a"), Peer(root, "b")
+    a.add("site", "https://a.example")
+    expect(failures, "pull : changements récupérés", b.pull(), 1)
+    expect(failures, "pull : favoris de B", b.websites, {"site": "https://a.example"})
+    a.delete("site")
+    b.pull()
+    expect(failures, "suppression : favoris de B", b.websites, {})
+    # Une nouvelle lecture ne rejoue rien
+    expect(failures, "suppression : deuxième pull", b.pull(), 0)
+
+def check_compaction_and_late_joiner(root, failures):
+    """Après compactage (segments supprimés), un nouveau poste retrouve tout l'état."""
+    a, b = Peer(root, "a"), Peer(root, "b")
+    a.add("gardé", "https://garde.example")
+    a.add("supprimé", "https://supprime.example")
+    a.delete("supprimé")
+    b.add("de-b", "https://b.example")
+    a.compact()
+    b.compact()
+    segments = [name for name in os.listdir(os.path.join(root, "partage")) if name.startswith("ops-")]
+    expect(failures, "compactage : anciens segments supprimés", segments, [])
+    c = Peer(root, "c")
+    c.pull()
+    expect(failures, "poste tardif : favoris de C", c.websites,
+           {"gardé": "https://garde.example", "de-b": "https://b.example"})
+
+def check_concurrent_snapshots(root, failures):
+    """
+    B compacte pendant le compactage de A (après la lecture du dossier partagé par A, avant l'écriture
+    de son instantané) : chaque poste écrit son propre instantané, aucun n'écrase les changements de l'autre.
+    """
+    a, b = Peer(root, "a"), Peer(root, "b")
+    a.add("de-a", "https://a.example")
+    b.pull()
+
+    write_json_atomic = fav_sync._write_json_atomic
+    def b_compacts_first(path, data):
+        fav_sync._write_json_atomic = write_json_atomic
+        b.add("b", "https://b.example")
+        b.compact()         # Le segment de B est supprimé : "b" n'est plus que dans son instantané
+        write_json_atomic(path, data)
+    fav_sync._write_json_atomic = b_compacts_first
+    try:
+        a.compact()
+    finally:
+        fav_sync._write_json_atomic = write_json_atomic
+
+    c = Peer(root, "c")
+    c.pull()
+    a.pull()
+    expected = {"de-a": "https://a.example", "b": "https://b.example"}
+    expect(failures, "instantanés concurrents : favoris de C", c.websites, expected)
+    expect(failures, "instantanés concurrents : favoris de A", a.websites, expected)
+
+def check_restart(root, failures):
+    """Un poste redémarré garde son identité et ne rejoue pas ce qu'il a déjà vu."""
+    a, b = Peer(root, "a"), Peer(root, "b")
+    a.add("site", "https://a.example")
+    b.pull()
+    peer_id = b.log.peer_id
+    b.open()
+    expect(failures, "redémarrage : identité conservée", b.log.peer_id, peer_id)
+    expect(failures, "redémarrage : rien à rejouer", b.pull(), 0)
+    # L'horodatage connu du favori survit au redémarrage : une suppression plus récente s'applique
+    a.delete("site")
+    b.pull()
+    expect(failures, "redémarrage : suppression appliquée", b.websites, {})
+
+def check_state_cost(root, failures):
+    """Un changement local n'ajoute qu'une petite ligne au fichier d'état, quelle que soit la collection."""
+    a = Peer(root, "a")
+    a.log.record_many([("websites", f"site-{i:05d}", f"https://site-{i}.example") for i in range(5000)])
+    a.log.checkpoint_state()
+    size_before = os.path.getsize(a.log.state_file)
+    a.add("nouveau", "https://nouveau.example")
+    growth = os.path.getsize(a.log.state_file) - size_before
+    if growth > 1024:
+        failures.append(f"coût de sauvegarde : {growth} octets écrits pour un seul changement")
+    a.open()
+    expect(failures, "coût de sauvegarde : favoris relus", len(a.log.entries["websites"]), 5001)
+
+def main():
+    scenarios = (check_pull_and_tombstone, check_compaction_and_late_joiner,
+                 check_concurrent_snapshots, check_restart, check_state_cost)
+    failures = []
+    for scenario in scenarios:
+        with tempfile.TemporaryDirectory(prefix="favme-synccheck-") as root:
+            scenario(root, failures)
+    if failures:
+        print("ÉCHEC : synchronisation incorrecte")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print(f"OK : {len(scenarios)} scénarios de synchronisation vérifiés")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())